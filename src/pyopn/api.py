@@ -1,16 +1,23 @@
-import logging
+import threading
 from pathlib import Path
-from typing import Any, Optional, Union, cast
-from urllib.parse import urlparse
-
-import validators
-
-from pyopn.constants import DEFAULT_TIMEOUT
+from types import TracebackType
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pyopn.constants import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUS_CODES,
+)
 from pyopn.core.dhcpv4_namespace import Dhcpv4Namespace
 from pyopn.core.kea_namespace import KeaNamespace
-
-# Create a module-level logger
-logger = logging.getLogger(__name__)
+from pyopn.utils import format_base_url, load_credentials
 
 
 class OPNsenseAPI(object):
@@ -24,99 +31,93 @@ class OPNsenseAPI(object):
         api_secret: Optional[str] = None,
         verify_cert: bool = False,
         timeout: int = DEFAULT_TIMEOUT,
+        strict: bool = False,
     ) -> None:
-        """Initialize OPNsense API object with API key file or API credentials."""
-        # Load credentials: Cred file, directly, or throw error
-        if api_key_file:
-            logger.info("Initializing OPNSenseAPI with API key file.")
-            self.api_key, self.api_secret = self._load_keys_from_file(api_key_file)
-        elif api_key and api_secret:
-            logger.info("Initializing OPNSenseAPI with API key and secret.")
-            self.api_key = api_key
-            self.api_secret = api_secret
-        else:
-            logger.error(
-                "Initialization failed: Neither api_key_file nor both api_key and api_secret provided."
-            )
-            msg = "You must provide either an api_key_file path or both api_key and api_secret for initialization."
-            raise ValueError(msg)
-
-        if validators.url(base_url):
-            self.base_url = self._format_base_url(base_url)
-        else:
-            msg = f"Provided OPNsense base URL is not valid: {base_url}"
-            raise ValueError(msg)
+        """Initialize OPNsense API object with API key file or API credentials.
+
+        :param bool strict: If True, also check that the host in `base_url` is a valid
+            hostname or IP address and that the port is in range.
+        """
+        self.api_key, self.api_secret = load_credentials(
+            api_key_file, api_key, api_secret
+        )
+        self.base_url = format_base_url(base_url, strict=strict)
 
         self.verify_cert = verify_cert
         self.timeout = timeout
 
-        # Lazy initialization of namespaces
-        self._namespaces: dict[str, Any] = {}
+        # Shared session so every client reuses pooled keep-alive connections
+        self._session = self._create_session()
 
-    def _format_base_url(self, base_url: str) -> str:
-        """Ensure that the base_url is properly formatted."""
-        base_url = base_url.rstrip("/")
+        # Lazy initialization of namespaces
+        self._ns_lock = threading.Lock()
+        self._dhcpv4: Optional[Dhcpv4Namespace] = None
+        self._kea: Optional[KeaNamespace] = None
 
-        if not base_url.endswith("/api"):
-            parsed_url = urlparse(base_url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/api"
+    def __enter__(self) -> "OPNsenseAPI":
+        """Enter the context manager."""
+        return self
 
-        return base_url
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the shared HTTP session when leaving the context manager."""
+        self.close()
+
+    def _create_session(self) -> requests.Session:
+        """Create the HTTP session shared by all clients of this wrapper."""
+        session = requests.Session()
+        session.auth = (self.api_key, self.api_secret)
+        adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=DEFAULT_MAX_RETRIES,
+                backoff_factor=DEFAULT_RETRY_BACKOFF,
+                status_forcelist=RETRY_STATUS_CODES,
+                # Hand the final response back so it surfaces as an APIError
+                raise_on_status=False,
+            ),
+        )
+        session.mount(self.base_url, adapter)
+        return session
 
     def _set_credentials(self, api_key: str, api_secret: str) -> None:
-        """Update API credentials and invalidate existing namespaces."""
+        """Update API credentials on the session and every live client."""
         self.api_key = api_key
         self.api_secret = api_secret
-        self._namespaces.clear()
+        # Swap auth in place so pooled connections survive credential rotation
+        self._session.auth = (api_key, api_secret)
+        with self._ns_lock:
+            for namespace in (self._dhcpv4, self._kea):
+                if namespace is not None:
+                    namespace._set_credentials(api_key, api_secret)
 
-    def _load_keys_from_file(self, file_path: Union[str, Path]) -> tuple[str, str]:
-        """Load the API key and secret from a file.
-
-        :param str | Path file_path: Path to the file containing API credentials
-        :returns: A tuple containing the API key and secret
-        :rtype: tuple[str, str]
-        :raises FileNotFoundError: If the file does not exist
-        :raises ValueError: If the file contents are invalid or malformed
-        """
-        path = Path(file_path)
-        if not path.is_file():
-            logger.error("File not found: %s", file_path)
-            msg = f"The file at {file_path} does not exist."
-            raise FileNotFoundError(msg)
-
-        logger.debug("Reading API credentials from file: %s", file_path)
-        keys = {}
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    if "=" in line:
-                        key, value = line.strip().split("=", 1)
-                        keys[key.strip()] = value.strip().strip('"')  # Remove quotes
-
-            if "key" not in keys or "secret" not in keys:
-                logger.error(
-                    "Invalid file format in %s: Missing 'key' or 'secret'.", file_path
-                )
-                msg = "The file must contain both 'key' and 'secret' in the format key=\"value\"."
-                raise ValueError(msg)
-
-            logger.info("API credentials successfully loaded from file: %s", file_path)
-            return keys["key"], keys["secret"]
-        except Exception as e:
-            msg = f"Error parsing the API key file: {e}"
-            logger.error(msg)
-            raise ValueError(msg) from e
+    def close(self) -> None:
+        """Close the shared HTTP session and release pooled connections."""
+        self._session.close()
 
     @property
     def dhcpv4(self) -> Dhcpv4Namespace:
         """Access the ISC DHCPv4 module."""
-        if "dhcpv4" not in self._namespaces:
-            self._namespaces["dhcpv4"] = Dhcpv4Namespace(self)
-        return cast(Dhcpv4Namespace, self._namespaces["dhcpv4"])
+        namespace = self._dhcpv4
+        if namespace is None:
+            with self._ns_lock:
+                if self._dhcpv4 is None:
+                    self._dhcpv4 = Dhcpv4Namespace(self)
+                namespace = self._dhcpv4
+        return namespace
 
     @property
     def kea(self) -> KeaNamespace:
         """Access the Kea DHCPv4 module."""
-        if "kea" not in self._namespaces:
-            self._namespaces["kea"] = KeaNamespace(self)
-        return cast(KeaNamespace, self._namespaces["kea"])
+        namespace = self._kea
+        if namespace is None:
+            with self._ns_lock:
+                if self._kea is None:
+                    self._kea = KeaNamespace(self)
+                namespace = self._kea
+        return namespace
@@ -0,0 +1,101 @@
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Union
+
+try:
+    import httpx
+except ImportError as e:
+    msg = (
+        "The asyncio clients require httpx. Install them with: pip install pyopn[async]"
+    )
+    raise ImportError(msg) from e
+
+from pyopn.constants import (
+    ASYNC_MAX_CONNECTIONS,
+    ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_TIMEOUT,
+)
+from pyopn.core.kea_async_namespace import AsyncKeaNamespace
+from pyopn.utils import format_base_url, load_credentials
+
+
+class AsyncOPNsenseAPI(object):
+    """Asyncio wrapper class to manage namespaces and API credentials.
+
+    Example:
+        ```python
+        async with AsyncOPNsenseAPI("https://192.168.199.1", api_key_file="apikey.txt") as opn:
+            reservations = await opn.kea.dhcpv4.get_reservations(uuids)
+        ```
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str,
+        api_key_file: Optional[Union[str, Path]] = None,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        verify_cert: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        strict: bool = False,
+    ) -> None:
+        """Initialize asyncio OPNsense API object with API key file or API credentials.
+
+        :param bool strict: If True, also check that the host in `base_url` is a valid
+            hostname or IP address and that the port is in range.
+        """
+        self.api_key, self.api_secret = load_credentials(
+            api_key_file, api_key, api_secret
+        )
+        self.base_url = format_base_url(base_url, strict=strict)
+        self.verify_cert = verify_cert
+        self.timeout = timeout
+
+        # Shared client so every namespace client reuses pooled HTTP/2 connections
+        self._session = httpx.AsyncClient(
+            auth=(self.api_key, self.api_secret),
+            verify=self.verify_cert,
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
+        # Lazy initialization of namespaces
+        self._kea: Optional[AsyncKeaNamespace] = None
+
+    async def __aenter__(self) -> "AsyncOPNsenseAPI":
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the shared HTTP client when leaving the async context manager."""
+        await self.aclose()
+
+    def _set_credentials(self, api_key: str, api_secret: str) -> None:
+        """Update API credentials on the session and every live client."""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        # Swap auth in place so pooled connections survive credential rotation
+        self._session.auth = (api_key, api_secret)
+        if self._kea is not None:
+            self._kea._set_credentials(api_key, api_secret)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release pooled connections."""
+        await self._session.aclose()
+
+    @property
+    def kea(self) -> AsyncKeaNamespace:
+        """Access the Kea DHCPv4 module."""
+        if self._kea is None:
+            self._kea = AsyncKeaNamespace(self)
+        return self._kea
@@ -0,0 +1,170 @@
+# Copyright 2024 Alex Christy
+#
+# This file is part of pyopn
+#
+# pyopn is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyopn is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyopn. If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+from types import TracebackType
+from typing import Any, Literal, Optional, Union, overload
+
+try:
+    import httpx
+except ImportError as e:
+    msg = (
+        "The asyncio clients require httpx. Install them with: pip install pyopn[async]"
+    )
+    raise ImportError(msg) from e
+
+from pyopn import exceptions
+from pyopn.constants import DEFAULT_TIMEOUT, HTTP_SUCCESS
+
+
+class AsyncOPNClient(object):
+    """Representation of the asyncio OPNsense API client."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str,
+        verify_cert: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """Initialize the asyncio OPNsense API client.
+
+        :param httpx.AsyncClient session: Optional client to send requests with. Pass
+            a shared client to reuse pooled connections across clients. A private
+            client is created if none is provided and is closed by `aclose`.
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.verify_cert = verify_cert
+        self.timeout = timeout
+        # Only a private client is closed by `aclose`, a shared one belongs to the caller
+        self._owns_session = session is None
+        self._session = (
+            session
+            if session is not None
+            else httpx.AsyncClient(verify=verify_cert, timeout=timeout)
+        )
+        # Built once and passed to every request, see `_set_credentials`
+        self._req_kwargs: dict[str, Any] = {
+            "auth": (api_key, api_secret),
+            "timeout": timeout,
+        }
+
+    async def __aenter__(self) -> "AsyncOPNClient":
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the private HTTP client when leaving the async context manager."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if it was created by this client."""
+        if self._owns_session:
+            await self._session.aclose()
+
+    def _set_credentials(self, api_key: str, api_secret: str) -> None:
+        """Update the API credentials used by this client's requests."""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._req_kwargs["auth"] = (api_key, api_secret)
+
+    def _process_response(
+        self, response: httpx.Response, raw: bool
+    ) -> Union[str, dict[str, Any]]:
+        """Return data from response objects.
+
+        :param Response response: Response object to process.
+        :param bool raw: If True, return the raw text response as a string.
+                    If False, return the JSON response parsed as a dictionary.
+
+        :return: A string containing the raw text response if `raw` is `True`. A dictionary of the JSON response if `raw` is `False`.
+        :rtype: Union[str, dict[str, Any]]
+        """
+        if response.status_code in HTTP_SUCCESS:
+            return str(response.text) if raw else json.loads(response.text)
+        raise exceptions.APIError(
+            status_code=response.status_code, resp_body=response.text
+        )
+
+    @overload
+    async def _get(self, endpoint: str, raw: Literal[True]) -> str: ...
+
+    @overload
+    async def _get(self, endpoint: str, raw: Literal[False]) -> dict[str, Any]: ...
+
+    async def _get(self, endpoint: str, raw: bool) -> Union[str, dict[str, Any]]:
+        """Send GET request to the specified endpoint.
+
+        :param str endpoint: API endpoint to send the request to.
+        :param bool raw: If True, return the raw text response as a string.
+                    If False, return the JSON response parsed as a dictionary.
+
+        :return: A string containing the raw text response if `raw` is `True`. A dictionary of the JSON response if `raw` is `False`.
+        :rtype: Union[str, dict[str, Any]]
+        """
+        req_url = "{}/{}".format(self.base_url, endpoint)
+        response = await self._session.get(
+            req_url,
+            **self._req_kwargs,
+        )
+        return self._process_response(response, raw)
+
+    @overload
+    async def _post(
+        self, endpoint: str, data: dict[str, Any], raw: Literal[True]
+    ) -> str: ...
+
+    @overload
+    async def _post(
+        self, endpoint: str, data: dict[str, Any], raw: Literal[False]
+    ) -> dict[str, Any]: ...
+
+    async def _post(
+        self, endpoint: str, data: dict[str, Any], raw: bool
+    ) -> Union[str, dict[str, Any]]:
+        """Send POST request to the specified endpoint with a JSON payload.
+
+        :param str endpoint: API endpoint to send the request to.
+        :param dict[str, Any] data: Dictionary to send as JSON body. If empty, the
+                    request is sent without a body.
+        :param bool raw: If True, return the raw text response as a string.
+                    If False, return the JSON response parsed as a dictionary.
+
+        :return: A string containing the raw text response if `raw` is `True`. A dictionary of the JSON response if `raw` is `False`.
+        :rtype: Union[str, dict[str, Any]]
+        """
+        req_url = "{}/{}".format(self.base_url, endpoint)
+        if not data:
+            # Empty payloads are sent without a body or JSON content type
+            response = await self._session.post(req_url, **self._req_kwargs)
+        else:
+            response = await self._session.post(
+                req_url,
+                json=data,
+                **self._req_kwargs,
+            )
+        return self._process_response(response, raw)
@@ -18,5 +18,11 @@ class BaseNamespace:
                 self._wrapper.base_url,
                 self._wrapper.verify_cert,
                 self._wrapper.timeout,
+                session=self._wrapper._session,
             )
         return self._clients[name]
+
+    def _set_credentials(self, api_key: str, api_secret: str) -> None:
+        """Update API credentials on every client initialized so far."""
+        for client in self._clients.values():
+            client._set_credentials(api_key, api_secret)
@@ -17,27 +17,42 @@
 
 
 import json
-from typing import Any, Literal, Union, overload
+import os
+from collections.abc import Iterator
+from types import TracebackType
+from typing import Any, Literal, Optional, Union, overload
 
 import requests
 import urllib3
 
 from pyopn import exceptions
-from pyopn.constants import DEFAULT_TIMEOUT, HTTP_SUCCESS
+from pyopn.constants import (
+    DEFAULT_TIMEOUT,
+    DOWNLOAD_CHUNK_SIZE,
+    HTTP_SUCCESS,
+    STREAM_UPLOAD_THRESHOLD,
+    UPLOAD_CHUNK_SIZE,
+)
 
 
 class OPNClient(object):
     """Representation of the OPNsense API client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         api_key: str,
         api_secret: str,
         base_url: str,
         verify_cert: bool = False,
         timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
     ) -> None:
-        """Initialize the OPNsense API client."""
+        """Initialize the OPNsense API client.
+
+        :param requests.Session session: Optional session to send requests with. Pass
+            a shared session to reuse pooled keep-alive connections across clients.
+            A private session is created if none is provided and is closed by `close`.
+        """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url
@@ -45,6 +60,39 @@ class OPNClient(object):
         if not self.verify_cert:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         self.timeout = timeout
+        # Only a private session is closed by `close`, a shared one belongs to the caller
+        self._owns_session = session is None
+        self._session = session if session is not None else requests.Session()
+        # Built once and passed to every request, see `_set_credentials`
+        self._req_kwargs: dict[str, Any] = {
+            "auth": (api_key, api_secret),
+            "verify": verify_cert,
+            "timeout": timeout,
+        }
+
+    def __enter__(self) -> "OPNClient":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the private HTTP session when leaving the context manager."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP session if it was created by this client."""
+        if self._owns_session:
+            self._session.close()
+
+    def _set_credentials(self, api_key: str, api_secret: str) -> None:
+        """Update the API credentials used by this client's requests."""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._req_kwargs["auth"] = (api_key, api_secret)
 
     def _process_response(
         self, response: requests.Response, raw: bool
@@ -81,14 +129,35 @@ class OPNClient(object):
         :rtype: Union[str, dict[str, Any]]
         """
         req_url = "{}/{}".format(self.base_url, endpoint)
-        response = requests.get(
+        response = self._session.get(
             req_url,
-            verify=self.verify_cert,
-            auth=(self.api_key, self.api_secret),
-            timeout=self.timeout,
+            **self._req_kwargs,
         )
         return self._process_response(response, raw)
 
+    def _get_stream(
+        self, endpoint: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Send GET request to the specified endpoint and stream the response body.
+
+        :param str endpoint: API endpoint to send the request to.
+        :param int chunk_size: Maximum number of bytes to yield at a time.
+
+        :return: Raw chunks of the response body.
+        :rtype: Iterator[bytes]
+        """
+        req_url = "{}/{}".format(self.base_url, endpoint)
+        with self._session.get(
+            req_url,
+            **self._req_kwargs,
+            stream=True,
+        ) as response:
+            if response.status_code not in HTTP_SUCCESS:
+                raise exceptions.APIError(
+                    status_code=response.status_code, resp_body=response.text
+                )
+            yield from response.iter_content(chunk_size=chunk_size)
+
     @overload
     def _post(self, endpoint: str, data: dict[str, Any], raw: Literal[True]) -> str: ...
 
@@ -103,7 +172,8 @@ class OPNClient(object):
         """Send POST request to the specified endpoint with a JSON payload.
 
         :param str endpoint: API endpoint to send the request to.
-        :param dict[str, Any] data: Dictionary to send as JSON body.
+        :param dict[str, Any] data: Dictionary to send as JSON body. If empty, the
+                    request is sent without a body.
         :param bool raw: If True, return the raw text response as a string.
                     If False, return the JSON response parsed as a dictionary.
 
@@ -111,13 +181,15 @@ class OPNClient(object):
         :rtype: Union[str, dict[str, Any]]
         """
         req_url = "{}/{}".format(self.base_url, endpoint)
-        response = requests.post(
-            req_url,
-            json=data,
-            verify=self.verify_cert,
-            auth=(self.api_key, self.api_secret),
-            timeout=self.timeout,
-        )
+        if not data:
+            # Empty payloads are sent without a body or JSON content type
+            response = self._session.post(req_url, **self._req_kwargs)
+        else:
+            response = self._session.post(
+                req_url,
+                json=data,
+                **self._req_kwargs,
+            )
         return self._process_response(response, raw)
 
     @overload
@@ -142,23 +214,48 @@ class OPNClient(object):
         :rtype: Union[str, dict[str, Any]]
         """
         req_url = f"{self.base_url}/{endpoint}"
+        filename = file_path.rsplit("/", maxsplit=1)[-1]
 
-        # Read the file content
-        with open(file_path, "r") as f:
-            file_content = f.read()
+        # Small files are cheaper to send in one piece
+        if os.path.getsize(file_path) < STREAM_UPLOAD_THRESHOLD:
+            with open(file_path, "r") as f:
+                file_content = f.read()
 
-        # Prepare the JSON payload
-        payload = {"payload": file_content, "filename": file_path.split("/")[-1]}
+            # Prepare the JSON payload
+            payload = {"payload": file_content, "filename": filename}
+
+            response = self._session.post(
+                req_url,
+                json=payload,  # Send as JSON
+                **self._req_kwargs,
+            )
+            return self._process_response(response, raw)
 
-        response = requests.post(
+        # Stream larger files so the whole file is never held in memory
+        response = self._session.post(
             req_url,
-            json=payload,  # Send as JSON
-            verify=self.verify_cert,
-            auth=(self.api_key, self.api_secret),
-            timeout=self.timeout,
+            data=self._iter_file_payload(file_path, filename),
+            headers={"Content-Type": "application/json"},
+            **self._req_kwargs,
         )
         return self._process_response(response, raw)
 
+    def _iter_file_payload(self, file_path: str, filename: str) -> Iterator[bytes]:
+        """Yield the JSON upload payload for a file while reading it in chunks.
+
+        :param str file_path: Path of file to upload.
+        :param str filename: Filename to report in the payload.
+
+        :return: Encoded chunks of the `{"payload": ..., "filename": ...}` JSON body.
+        :rtype: Iterator[bytes]
+        """
+        yield b'{"payload": "'
+        with open(file_path, "r") as f:
+            while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                # Escape each chunk as a JSON string body without its quotes
+                yield json.dumps(chunk)[1:-1].encode("ascii")
+        yield f'", "filename": {json.dumps(filename)}}}'.encode("ascii")
+
     @overload
     def _post_csv_data(
         self, endpoint: str, csv_data: str, raw: Literal[True]
@@ -191,11 +288,9 @@ class OPNClient(object):
         }
 
         # Send the request
-        response = requests.post(
+        response = self._session.post(
             req_url,
             json=payload,  # Send as JSON
-            verify=self.verify_cert,
-            auth=(self.api_key, self.api_secret),
-            timeout=self.timeout,
+            **self._req_kwargs,
         )
         return self._process_response(response, raw)
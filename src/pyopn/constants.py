@@ -1,4 +1,20 @@
 DEFAULT_TIMEOUT = 5
 
+# Connection pooling for the shared HTTP session
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 32
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.2
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Connection limits for the shared asyncio HTTP client
+ASYNC_MAX_CONNECTIONS = 32
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = 16
+
+# Files at or above this size are streamed to the API instead of read into memory
+STREAM_UPLOAD_THRESHOLD = 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 # All the successful HTTP status codes from RFC 7231 & 4918
 HTTP_SUCCESS = (200, 201, 202, 203, 204, 205, 206, 207)
@@ -15,9 +15,35 @@
 # You should have received a copy of the GNU General Public License
 # along with pyopn. If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Any, Optional
-
-from pyopn import client
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, ClassVar, Optional, Union
+from uuid import UUID
+
+from pyopn import client, exceptions
+from pyopn.constants import DOWNLOAD_CHUNK_SIZE
+
+# Endpoint that applies the saved Kea configuration
+EP_SERVICE_RECONFIGURE = "kea/service/reconfigure"
+
+# Endpoint prefixes for UUID-parameterized requests
+EP_DHCPV4_ADD_PEER = "kea/dhcpv4/addPeer"
+EP_DHCPV4_GET_PEER = "kea/dhcpv4/getPeer/"
+EP_DHCPV4_SET_PEER = "kea/dhcpv4/setPeer/"
+EP_DHCPV4_DEL_PEER = "kea/dhcpv4/delPeer/"
+EP_DHCPV4_ADD_RESERVATION = "kea/dhcpv4/addReservation"
+EP_DHCPV4_GET_RESERVATION = "kea/dhcpv4/getReservation/"
+EP_DHCPV4_SET_RESERVATION = "kea/dhcpv4/setReservation/"
+EP_DHCPV4_DEL_RESERVATION = "kea/dhcpv4/delReservation/"
+EP_DHCPV4_ADD_SUBNET = "kea/dhcpv4/addSubnet"
+EP_DHCPV4_GET_SUBNET = "kea/dhcpv4/getSubnet/"
+EP_DHCPV4_SET_SUBNET = "kea/dhcpv4/setSubnet/"
+EP_DHCPV4_DEL_SUBNET = "kea/dhcpv4/delSubnet/"
+
+# Values of the `result` field OPNsense returns when a change was not saved
+_FAILED_RESULTS = ("failed", "not found")
 
 
 class CtrlAgentClient(client.OPNClient):
@@ -77,6 +103,20 @@ class Dhcpv4Client(client.OPNClient):
     :param str base_url: The base API endpoint for the OPNsense deployment
     """
 
+    # Mutating methods that can be batched with `apply`:
+    # (endpoint, takes UUID, takes request body)
+    _ENDPOINTS: ClassVar[dict[str, tuple[str, bool, bool]]] = {
+        "add_subnet": (EP_DHCPV4_ADD_SUBNET, False, True),
+        "set_subnet": (EP_DHCPV4_SET_SUBNET, True, True),
+        "del_subnet": (EP_DHCPV4_DEL_SUBNET, True, False),
+        "add_reservation": (EP_DHCPV4_ADD_RESERVATION, False, True),
+        "set_reservation": (EP_DHCPV4_SET_RESERVATION, True, True),
+        "del_reservation": (EP_DHCPV4_DEL_RESERVATION, True, False),
+        "add_peer": (EP_DHCPV4_ADD_PEER, False, True),
+        "set_peer": (EP_DHCPV4_SET_PEER, True, True),
+        "del_peer": (EP_DHCPV4_DEL_PEER, True, False),
+    }
+
     def get(self) -> dict[str, Any]:
         """Get the Kea DHCPv4 server configuration.
 
@@ -121,11 +161,116 @@ class Dhcpv4Client(client.OPNClient):
             data = {}
         return self._post("kea/dhcpv4/set", data, raw=False)
 
-    def add_subnet(self, data: dict[str, Any]) -> dict[str, Any]:
+    def apply(self, actions: Optional[list[tuple[Any, ...]]] = None) -> dict[str, Any]:
+        """Run a batch of changes and apply them with a single set and reconfigure.
+
+        Each action is sent in order over the shared session, then exactly one POST
+        to `kea/dhcpv4/set` and one to `kea/service/reconfigure` applies them all.
+
+        **Note:** OPNsense saves each action to its configuration as soon as it is
+        sent. If an action fails, either with an HTTP error or with a `"failed"` or
+        `"not found"` result (e.g. a validation error), the batch stops before the
+        set and reconfigure requests. Actions sent before the failing one stay saved
+        but are not applied until the next set and reconfigure.
+
+        :param list actions: Tuples of a mutating method name followed by its
+            positional arguments. Supported methods are the `add_*`, `set_*`, and
+            `del_*` methods for subnets, reservations, and peers. If omitted, only
+            the pending changes are applied.
+
+        Example:
+            ```python
+            actions = [
+                ("add_reservation", {"reservation": {...}}),
+                ("set_subnet", "f0e59e66-194c-4a61-b6ee-e8e67c545788", {"subnet4": {...}}),
+                ("del_peer", "0c8b5d4e-3c9f-4f0e-9a57-6d7f1f3c2b1a"),
+            ]
+            ```
+
+        :return: Responses for each action, the set, and the reconfigure requests.
+        :rtype: dict[str, Any]
+
+        :raises ValueError: If an action names an unsupported method or its arguments
+            do not match the UUID and request body the method expects. Every action
+            is checked before any request is sent.
+        :raises APIError: If an action fails or is rejected by OPNsense.
+
+        """
+        actions = actions or []
+        for name, *args in actions:
+            self._check_action(name, args)
+
+        results = []
+        for name, *args in actions:
+            response = self._call(name, *args)
+            if response.get("result") in _FAILED_RESULTS:
+                raise exceptions.APIError(status_code=200, resp_body=response)
+            results.append(response)
+
+        return {
+            "actions": results,
+            "set": self.set(),
+            "reconfigure": self._post(EP_SERVICE_RECONFIGURE, {}, raw=False),
+        }
+
+    def _check_action(self, name: str, args: list[Any]) -> None:
+        """Check that a batched action names a mutating method with valid arguments.
+
+        :param str name: Name of an `add_*`, `set_*`, or `del_*` method.
+        :param list args: The positional arguments given for the method.
+
+        :raises ValueError: If `name` is not a mutating endpoint or `args` do not
+            match the UUID and request body it expects.
+        """
+        try:
+            _, takes_uuid, takes_data = self._ENDPOINTS[name]
+        except KeyError:
+            msg = f"Unsupported action for apply: {name}"
+            raise ValueError(msg) from None
+
+        expected = ((str, UUID),) * takes_uuid + (dict,) * takes_data
+        if len(args) != len(expected) or not all(
+            isinstance(arg, arg_type)
+            for arg, arg_type in zip(args, expected, strict=True)
+        ):
+            usage = ", ".join(["uuid"] * takes_uuid + ["data"] * takes_data)
+            msg = f"Invalid arguments for {name}: expected ({usage})"
+            raise ValueError(msg)
+
+    def _call(self, name: str, *args: Any) -> dict[str, Any]:  # noqa: ANN401
+        """POST to a mutating endpoint by method name without applying the change.
+
+        :param str name: Name of an `add_*`, `set_*`, or `del_*` method.
+        :param args: The UUID, if the endpoint takes one, followed by the request body.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        endpoint, takes_uuid, takes_data = self._ENDPOINTS[name]
+        if takes_uuid:
+            endpoint += str(args[0])
+        return self._post(endpoint, args[-1] if takes_data else {}, raw=False)
+
+    def bulk_add_reservations(
+        self, reservations: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Add several reservations to the Kea DHCPv4 server and apply them once.
+
+        :param list reservations: Request bodies as accepted by `add_reservation`.
+
+        :return: Responses for each reservation, the set, and the reconfigure requests.
+        :rtype: dict[str, Any]
+        """
+        return self.apply([("add_reservation", data) for data in reservations])
+
+    def add_subnet(
+        self, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         r"""Add subnet to the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -157,24 +302,34 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post("kea/dhcpv4/addSubnet", data, raw=False)
+        response = self._call("add_subnet", data)
+        if not defer_apply:
+            self.apply()
+        return response
 
-    def del_subnet(self, uuid: str) -> dict[str, Any]:
+    def del_subnet(self, uuid: str, *, defer_apply: bool = True) -> dict[str, Any]:
         """Delete the subnet configuration on the Kea DHCPv4 server by UUID.
 
         **Note:** Make sure to POST to the `kea/service/reconfigure` endpoint after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         :param str uuid: The UUID of the subnet to delete.
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
 
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._post(f"kea/dhcpv4/delSubnet/{uuid}", {}, raw=False)
+        response = self._call("del_subnet", uuid)
+        if not defer_apply:
+            self.apply()
+        return response
 
     def get_subnet(self, uuid: str) -> dict[str, Any]:
         """Get the configuration of a subnet on the Kea DHCPv4 server.
@@ -184,7 +339,7 @@ class Dhcpv4Client(client.OPNClient):
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._get(f"kea/dhcpv4/getSubnet/{uuid}", raw=False)
+        return self._get(EP_DHCPV4_GET_SUBNET + str(uuid), raw=False)
 
     def search_subnet(self) -> dict[str, Any]:
         """Get the configured subnets for the Kea DHCPv4 server.
@@ -194,11 +349,14 @@ class Dhcpv4Client(client.OPNClient):
         """
         return self._get("kea/dhcpv4/searchSubnet", raw=False)
 
-    def set_subnet(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+    def set_subnet(
+        self, uuid: str, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         r"""Set subnet configuration on the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to apply changes.
+        to apply changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -231,11 +389,16 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post(f"kea/dhcpv4/setSubnet/{uuid}", data, raw=False)
+        response = self._call("set_subnet", uuid, data)
+        if not defer_apply:
+            self.apply()
+        return response
 
     def search_reservation(self) -> dict[str, Any]:
         """Get the configured reservations on the Kea DHCPv4 server.
@@ -245,11 +408,14 @@ class Dhcpv4Client(client.OPNClient):
         """
         return self._get("kea/dhcpv4/searchReservation", raw=False)
 
-    def add_reservation(self, data: dict[str, Any]) -> dict[str, Any]:
+    def add_reservation(
+        self, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         """Add reservation to the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -269,24 +435,34 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post("kea/dhcpv4/addReservation", data, raw=False)
+        response = self._call("add_reservation", data)
+        if not defer_apply:
+            self.apply()
+        return response
 
-    def del_reservation(self, uuid: str) -> dict[str, Any]:
+    def del_reservation(self, uuid: str, *, defer_apply: bool = True) -> dict[str, Any]:
         """Delete reservation but UUID on the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/service/reconfigure` endpoint after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         :param str uuid: UUID of the DHCP reservation to delete.
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
 
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._post(f"kea/dhcpv4/delReservation/{uuid}", {}, raw=False)
+        response = self._call("del_reservation", uuid)
+        if not defer_apply:
+            self.apply()
+        return response
 
     def download_reservations(self) -> str:
         """Download CSV of reservations on the Kea DHCPv4 server.
@@ -294,7 +470,39 @@ class Dhcpv4Client(client.OPNClient):
         :return: CSV-formatted string containing all DHCPv4 reservations configured on the Kea DHCPv4 server.
         :rtype: str
         """
-        return self._get("kea/dhcpv4/downloadReservations", raw=True)
+        return b"".join(self.iter_reservations_csv()).decode("utf-8")
+
+    def download_reservations_to_file(self, file_path: Union[str, Path]) -> None:
+        """Download CSV of reservations on the Kea DHCPv4 server directly to a file.
+
+        The CSV is written as it is received, so it is never held in memory whole.
+        It goes to a temporary file next to `file_path` that only replaces it once
+        the download succeeds, so a failed request leaves an existing file intact.
+
+        :param str | Path file_path: Path of the file to write the CSV to.
+        """
+        path = Path(file_path)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self.iter_reservations_csv():
+                    f.write(chunk)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def iter_reservations_csv(
+        self, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Stream CSV of reservations on the Kea DHCPv4 server.
+
+        :param int chunk_size: Maximum number of bytes to yield at a time.
+
+        :return: Raw chunks of the CSV-formatted reservations.
+        :rtype: Iterator[bytes]
+        """
+        return self._get_stream("kea/dhcpv4/downloadReservations", chunk_size)
 
     def get_reservation(self, uuid: str) -> dict[str, Any]:
         """Get configuration of the reservation on Kea DHCPv4 server by UUID.
@@ -304,13 +512,16 @@ class Dhcpv4Client(client.OPNClient):
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._get(f"kea/dhcpv4/getReservation/{uuid}", raw=False)
+        return self._get(EP_DHCPV4_GET_RESERVATION + str(uuid), raw=False)
 
-    def set_reservation(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+    def set_reservation(
+        self, uuid: str, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         """Set DHCP reservation configuration on the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -331,11 +542,16 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post(f"kea/dhcpv4/setReservation/{uuid}", data, raw=False)
+        response = self._call("set_reservation", uuid, data)
+        if not defer_apply:
+            self.apply()
+        return response
 
     def upload_reservations(
         self, file_path: Optional[str] = None, data: Optional[str] = None
@@ -390,26 +606,34 @@ class Dhcpv4Client(client.OPNClient):
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._get(f"kea/dhcpv4/getPeer/{uuid}", raw=False)
+        return self._get(EP_DHCPV4_GET_PEER + str(uuid), raw=False)
 
-    def del_peer(self, uuid: str) -> dict[str, Any]:
+    def del_peer(self, uuid: str, *, defer_apply: bool = True) -> dict[str, Any]:
         """Delete the peer on the Kea DHCPv4 server by UUID.
 
         **Note:** Make sure to POST to the `kea/service/reconfigure` endpoint after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         :param str uuid: The UUID of the peer to delete.
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
 
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._post(f"kea/dhcpv4/delPeer/{uuid}", {}, raw=False)
+        response = self._call("del_peer", uuid)
+        if not defer_apply:
+            self.apply()
+        return response
 
-    def add_peer(self, data: dict[str, Any]) -> dict[str, Any]:
+    def add_peer(
+        self, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         """Add peer to the Kea DHCPv4 server.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -427,17 +651,25 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post("kea/dhcpv4/addPeer", data, raw=False)
+        response = self._call("add_peer", data)
+        if not defer_apply:
+            self.apply()
+        return response
 
-    def set_peer(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+    def set_peer(
+        self, uuid: str, data: dict[str, Any], *, defer_apply: bool = True
+    ) -> dict[str, Any]:
         """Set configuration of peer on the Kea DHCPv4 server by UUID.
 
         **Note:** Make sure to POST to the `kea/dhcpv4/set` and then `kea/service/reconfigure` endpoints after this
-        to enable changes.
+        to enable changes. Alternatively, pass `defer_apply=False` or batch
+        changes with `apply`.
 
         This function uses the `KeaDhcpv4.xml` data model. For details, see:
         https://github.com/opnsense/core/blob/master/src/opnsense/mvc/app/models/OPNsense/Kea/KeaDhcpv4.xml
@@ -456,11 +688,16 @@ class Dhcpv4Client(client.OPNClient):
             }
             ```
 
+        :param bool defer_apply: If False, apply the change immediately with `apply`.
+
         :return: API response
         :rtype: dict[str, Any]
 
         """
-        return self._post(f"kea/dhcpv4/setPeer/{uuid}", data, raw=False)
+        response = self._call("set_peer", uuid, data)
+        if not defer_apply:
+            self.apply()
+        return response
 
 
 class Leases4Client(client.OPNClient):
@@ -494,7 +731,7 @@ class ServiceClient(client.OPNClient):
         :return: API response
         :rtype: dict[str, Any]
         """
-        return self._post("kea/service/reconfigure", {}, raw=False)
+        return self._post(EP_SERVICE_RECONFIGURE, {}, raw=False)
 
     def restart(self) -> dict[str, Any]:
         """Restart the Kea DHCPv4 service.
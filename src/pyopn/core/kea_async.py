@@ -0,0 +1,278 @@
+# Copyright 2024 Alex Christy
+#
+# This file is part of pyopn
+#
+# pyopn is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyopn is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyopn. If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from pyopn import async_client
+from pyopn.core.kea import (
+    EP_DHCPV4_ADD_PEER,
+    EP_DHCPV4_ADD_RESERVATION,
+    EP_DHCPV4_ADD_SUBNET,
+    EP_DHCPV4_DEL_PEER,
+    EP_DHCPV4_DEL_RESERVATION,
+    EP_DHCPV4_DEL_SUBNET,
+    EP_DHCPV4_GET_PEER,
+    EP_DHCPV4_GET_RESERVATION,
+    EP_DHCPV4_GET_SUBNET,
+    EP_DHCPV4_SET_PEER,
+    EP_DHCPV4_SET_RESERVATION,
+    EP_DHCPV4_SET_SUBNET,
+    EP_SERVICE_RECONFIGURE,
+)
+
+
+class AsyncDhcpv4Client(async_client.AsyncOPNClient):
+    """An asyncio client for interacting with the kea/dhcpv4 endpoints.
+
+    Request bodies and notes on applying changes are the same as for
+    `pyopn.core.kea.Dhcpv4Client`.
+
+    :param str api_key: The API key to use for requests
+    :param str api_secret: The API secret to use for requests
+    :param str base_url: The base API endpoint for the OPNsense deployment
+    """
+
+    async def get(self) -> dict[str, Any]:
+        """Get the Kea DHCPv4 server configuration.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get("kea/dhcpv4/get", raw=False)
+
+    async def set(self, data: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """Set configuration for the Kea DHCPv4 server.
+
+        :param dict data: Python dictionary to be used for the body of the request.
+            An empty dictionary applies pending settings.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        if not data:
+            data = {}
+        return await self._post("kea/dhcpv4/set", data, raw=False)
+
+    async def add_subnet(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Add subnet to the Kea DHCPv4 server.
+
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_ADD_SUBNET, data, raw=False)
+
+    async def del_subnet(self, uuid: str) -> dict[str, Any]:
+        """Delete the subnet configuration on the Kea DHCPv4 server by UUID.
+
+        :param str uuid: The UUID of the subnet to delete.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_DEL_SUBNET + str(uuid), {}, raw=False)
+
+    async def get_subnet(self, uuid: str) -> dict[str, Any]:
+        """Get the configuration of a subnet on the Kea DHCPv4 server.
+
+        :param str uuid: The UUID of the subnet to get the configuration for.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get(EP_DHCPV4_GET_SUBNET + str(uuid), raw=False)
+
+    async def search_subnet(self) -> dict[str, Any]:
+        """Get the configured subnets for the Kea DHCPv4 server.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get("kea/dhcpv4/searchSubnet", raw=False)
+
+    async def set_subnet(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Set subnet configuration on the Kea DHCPv4 server.
+
+        :param str uuid: The UUID of the subnet to set the configuration for.
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_SET_SUBNET + str(uuid), data, raw=False)
+
+    async def search_reservation(self) -> dict[str, Any]:
+        """Get the configured reservations on the Kea DHCPv4 server.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get("kea/dhcpv4/searchReservation", raw=False)
+
+    async def add_reservation(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Add reservation to the Kea DHCPv4 server.
+
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_ADD_RESERVATION, data, raw=False)
+
+    async def del_reservation(self, uuid: str) -> dict[str, Any]:
+        """Delete reservation by UUID on the Kea DHCPv4 server.
+
+        :param str uuid: UUID of the DHCP reservation to delete.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_DEL_RESERVATION + str(uuid), {}, raw=False)
+
+    async def get_reservation(self, uuid: str) -> dict[str, Any]:
+        """Get configuration of the reservation on Kea DHCPv4 server by UUID.
+
+        :param str uuid: The UUID of the DHCP reservation to get the configuration for.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get(EP_DHCPV4_GET_RESERVATION + str(uuid), raw=False)
+
+    async def get_reservations(self, uuids: Iterable[str]) -> list[dict[str, Any]]:
+        """Get configuration of several reservations on Kea DHCPv4 server concurrently.
+
+        :param Iterable[str] uuids: The UUIDs of the DHCP reservations to get.
+
+        :return: API responses in the same order as `uuids`
+        :rtype: list[dict[str, Any]]
+        """
+        return list(
+            await asyncio.gather(*(self.get_reservation(uuid) for uuid in uuids))
+        )
+
+    async def set_reservation(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Set DHCP reservation configuration on the Kea DHCPv4 server.
+
+        :param str uuid: The UUID of the reservation to set the configuration for.
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_SET_RESERVATION + str(uuid), data, raw=False)
+
+    async def search_peer(self) -> dict[str, Any]:
+        """Get the configured peers for the Kea DHCPv4 server.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get("kea/dhcpv4/searchPeer", raw=False)
+
+    async def get_peer(self, uuid: str) -> dict[str, Any]:
+        """Get the configuration for a peer on the Kea DHCPv4 server by UUID.
+
+        :param str uuid: The UUID of the peer to get the configuration for.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get(EP_DHCPV4_GET_PEER + str(uuid), raw=False)
+
+    async def del_peer(self, uuid: str) -> dict[str, Any]:
+        """Delete the peer on the Kea DHCPv4 server by UUID.
+
+        :param str uuid: The UUID of the peer to delete.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_DEL_PEER + str(uuid), {}, raw=False)
+
+    async def add_peer(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Add peer to the Kea DHCPv4 server.
+
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_ADD_PEER, data, raw=False)
+
+    async def set_peer(self, uuid: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Set configuration of peer on the Kea DHCPv4 server by UUID.
+
+        :param str uuid: The UUID of the peer to set the configuration for.
+        :param dict data: Python dictionary to be used for the body of the request.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_DHCPV4_SET_PEER + str(uuid), data, raw=False)
+
+
+class AsyncServiceClient(async_client.AsyncOPNClient):
+    """An asyncio client for interacting with the kea/service endpoint.
+
+    :param str api_key: The API key to use for requests
+    :param str api_secret: The API secret to use for requests
+    :param str base_url: The base API endpoint for the OPNsense deployment
+    """
+
+    async def reconfigure(self) -> dict[str, Any]:
+        """Enable/Reconfigure the Kea DHCP service with the currently set configuration.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post(EP_SERVICE_RECONFIGURE, {}, raw=False)
+
+    async def restart(self) -> dict[str, Any]:
+        """Restart the Kea DHCPv4 service.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post("kea/service/restart", {}, raw=False)
+
+    async def start(self) -> dict[str, Any]:
+        """Start the Kea DHCPv4 service.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post("kea/service/start", {}, raw=False)
+
+    async def status(self) -> dict[str, Any]:
+        """Get the status of the Kea DHCP service.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._get("kea/service/status", raw=False)
+
+    async def stop(self) -> dict[str, Any]:
+        """Stop the Kea DHCPv4 service.
+
+        :return: API response
+        :rtype: dict[str, Any]
+        """
+        return await self._post("kea/service/stop", {}, raw=False)
@@ -0,0 +1,28 @@
+from typing import Optional, cast
+
+from pyopn.base_namespace import BaseNamespace
+
+# Import the client class
+from pyopn.core.kea_async import AsyncDhcpv4Client, AsyncServiceClient
+
+
+class AsyncKeaNamespace(BaseNamespace):
+    """Namespace for asyncio Kea related API clients."""
+
+    # Internal attribute for lazy initialization
+    _dhcpv4: Optional[AsyncDhcpv4Client] = None
+    _service: Optional[AsyncServiceClient] = None
+
+    @property
+    def dhcpv4(self) -> AsyncDhcpv4Client:
+        """Access the Kea dhcpv4 controller."""
+        if not self._dhcpv4:
+            self._dhcpv4 = self._initialize_client("dhcpv4", AsyncDhcpv4Client)
+        return cast(AsyncDhcpv4Client, self._dhcpv4)
+
+    @property
+    def service(self) -> AsyncServiceClient:
+        """Access the Kea service controller."""
+        if not self._service:
+            self._service = self._initialize_client("service", AsyncServiceClient)
+        return cast(AsyncServiceClient, self._service)
@@ -0,0 +1,166 @@
+# Copyright 2024 Alex Christy
+#
+# This file is part of pyopn
+#
+# pyopn is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyopn is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyopn. If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import fixtures
+
+from pyopn import OPNsenseAPI, utils
+from pyopn.tests import base
+
+
+class TestOPNsenseAPI(base.TestCase):
+    """Class for testing the OPNsenseAPI class methods."""
+
+    def _make_api(self) -> OPNsenseAPI:
+        """Create an API wrapper with inline credentials."""
+        return OPNsenseAPI(
+            "https://opnsense.local",
+            api_key="key",
+            api_secret="secret",  # noqa: S106
+        )
+
+    def test_clients_share_session(self) -> None:
+        """Test that every namespace client reuses the wrapper's session."""
+        api = self._make_api()
+        self.assertIs(api._session, api.kea.dhcpv4._session)
+        self.assertIs(api._session, api.kea.service._session)
+        self.assertIs(api._session, api.dhcpv4.leases._session)
+
+    def test_set_credentials_keeps_session(self) -> None:
+        """Test that rotating credentials keeps the pooled session and clients."""
+        api = self._make_api()
+        session = api._session
+        dhcpv4 = api.kea.dhcpv4
+        api._set_credentials("new_key", "new_secret")
+        self.assertIs(session, api._session)
+        self.assertIs(dhcpv4, api.kea.dhcpv4)
+        self.assertEqual(("new_key", "new_secret"), session.auth)
+        self.assertEqual(("new_key", "new_secret"), dhcpv4._req_kwargs["auth"])
+        self.assertEqual("new_key", api.kea.service.api_key)
+
+    def test_close(self) -> None:
+        """Test that closing the wrapper closes the shared session."""
+        api = self._make_api()
+        with mock.patch.object(api._session, "close") as close_mock:
+            api.close()
+        close_mock.assert_called_once_with()
+
+    def test_context_manager(self) -> None:
+        """Test that leaving the context manager closes the shared session."""
+        api = self._make_api()
+        with mock.patch.object(api._session, "close") as close_mock:
+            with api as entered:
+                self.assertIs(api, entered)
+            close_mock.assert_called_once_with()
+
+    def test_namespace_is_cached(self) -> None:
+        """Test that namespace properties build their namespace only once."""
+        api = self._make_api()
+        self.assertIs(api.kea, api.kea)
+        self.assertIs(api.dhcpv4, api.dhcpv4)
+
+    def test_namespace_threaded_init(self) -> None:
+        """Test that concurrent first access yields a single namespace."""
+        api = self._make_api()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            namespaces = list(pool.map(lambda _: api.kea, range(32)))
+        self.assertTrue(all(ns is namespaces[0] for ns in namespaces))
+
+    def _write_key_file(self, content: str) -> str:
+        """Write an API key file to a temporary directory and return its path."""
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "apikey.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_load_keys_from_file(self) -> None:
+        """Test loading quoted and unquoted credentials from a key file."""
+        path = self._write_key_file('key="abc123"\r\nsecret = def456 \n')
+        api = OPNsenseAPI("https://opnsense.local", api_key_file=path)
+        self.assertEqual("abc123", api.api_key)
+        self.assertEqual("def456", api.api_secret)
+
+    def test_load_keys_from_file_missing_secret(self) -> None:
+        """Test that a key file without a secret is rejected."""
+        path = self._write_key_file('key="abc123"\n')
+        self.assertRaises(
+            ValueError, OPNsenseAPI, "https://opnsense.local", api_key_file=path
+        )
+
+    def test_load_keys_from_file_not_found(self) -> None:
+        """Test that a missing key file raises FileNotFoundError."""
+        self.assertRaises(
+            FileNotFoundError,
+            OPNsenseAPI,
+            "https://opnsense.local",
+            api_key_file="/nonexistent/apikey.txt",
+        )
+
+    def test_format_base_url(self) -> None:
+        """Test that base URLs are normalized to end in /api."""
+        for url, expected in (
+            ("https://opnsense.local", "https://opnsense.local/api"),
+            ("https://opnsense.local/", "https://opnsense.local/api"),
+            ("https://opnsense.local/api/", "https://opnsense.local/api"),
+            ("http://10.0.0.1:8443/ui/dashboard", "http://10.0.0.1:8443/api"),
+            ("https://opnsense.local/proxy/api", "https://opnsense.local/proxy/api"),
+        ):
+            self.assertEqual(expected, utils.format_base_url(url))
+
+    def test_invalid_base_url(self) -> None:
+        """Test that non-http(s) base URLs and queries or fragments are rejected."""
+        for url in (
+            "opnsense.local",
+            "ftp://opnsense.local",
+            "https://",
+            "https://opnsense.local?x=1",
+            "https://opnsense.local#frag",
+            "https://opnsense.local/api?x=1",
+        ):
+            self.assertRaises(
+                ValueError,
+                OPNsenseAPI,
+                url,
+                api_key="key",
+                api_secret="secret",  # noqa: S106
+            )
+
+    def test_strict_base_url(self) -> None:
+        """Test that strict mode validates the host and port of the base URL."""
+        for url in (
+            "https://opnsense.local",
+            "https://192.168.1.1:8443",
+            "https://[fe80::1]/api",
+            "https://[2001:db8::1]:8443",
+            "https://1.2.3.example.com",
+        ):
+            utils.format_base_url(url, strict=True)
+        for url in (
+            "https://opn_sense.local",
+            "https://-opnsense.local",
+            "https://opnsense.local:70000",
+            "https://[not-an-ip]",
+            "https://[1.2.3.4]",
+            "https://999.999.999.999",
+            "https://256.1.1.1:443",
+            "https://1.2.3",
+        ):
+            self.assertRaises(ValueError, utils.format_base_url, url, strict=True)
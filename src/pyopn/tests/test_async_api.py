@@ -0,0 +1,99 @@
+# Copyright 2024 Alex Christy
+#
+# This file is part of pyopn
+#
+# pyopn is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyopn is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyopn. If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import functools
+from unittest import mock
+
+import httpx
+
+from pyopn import exceptions
+from pyopn.async_api import AsyncOPNsenseAPI
+from pyopn.core.kea_async import AsyncServiceClient
+from pyopn.tests import base
+
+
+class TestAsyncOPNsenseAPI(base.TestCase):
+    """Class for testing the AsyncOPNsenseAPI class and its clients."""
+
+    def _make_api(self, handler: httpx.MockTransport) -> AsyncOPNsenseAPI:
+        """Create an API wrapper whose shared client uses a mock transport."""
+        client_factory = functools.partial(httpx.AsyncClient, transport=handler)
+        with mock.patch.object(httpx, "AsyncClient", client_factory):
+            return AsyncOPNsenseAPI(
+                "https://opnsense.local",
+                api_key="key",
+                api_secret="secret",  # noqa: S106
+            )
+
+    def test_clients_share_session(self) -> None:
+        """Test that every namespace client reuses the wrapper's client."""
+        api = self._make_api(httpx.MockTransport(lambda _: httpx.Response(200)))
+        self.assertIs(api._session, api.kea.dhcpv4._session)
+        self.assertIs(api._session, api.kea.service._session)
+        self.assertIs(api.kea, api.kea)
+        asyncio.run(api.aclose())
+        self.assertTrue(api._session.is_closed)
+
+    def test_client_closes_only_private_session(self) -> None:
+        """Test that a standalone client closes its own HTTP client only."""
+
+        async def run() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+            async with httpx.AsyncClient() as shared:
+                async with AsyncServiceClient("", "", "", session=shared):
+                    pass
+                self.assertFalse(shared.is_closed)
+                async with AsyncServiceClient("", "", "") as standalone:
+                    pass
+                return shared, standalone._session
+
+        shared, private = asyncio.run(run())
+        self.assertTrue(shared.is_closed)
+        self.assertTrue(private.is_closed)
+
+    def test_get_reservations(self) -> None:
+        """Test that reservations are fetched concurrently and kept in order."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            uuid = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={"reservation": {"uuid": uuid}})
+
+        async def run() -> list[dict[str, dict[str, str]]]:
+            async with self._make_api(httpx.MockTransport(handler)) as api:
+                return await api.kea.dhcpv4.get_reservations(["a", "b", "c"])
+
+        resp = asyncio.run(run())
+        self.assertEqual(
+            ["a", "b", "c"], [item["reservation"]["uuid"] for item in resp]
+        )
+        self.assertEqual(
+            sorted(f"/api/kea/dhcpv4/getReservation/{u}" for u in "abc"),
+            sorted(requested),
+        )
+
+    def test_post_failure(self) -> None:
+        """Test that failed requests raise APIError."""
+        handler = httpx.MockTransport(lambda _: httpx.Response(401, json={"a": "b"}))
+
+        async def run() -> None:
+            async with self._make_api(handler) as api:
+                await api.kea.service.reconfigure()
+
+        self.assertRaises(exceptions.APIError, asyncio.run, run())
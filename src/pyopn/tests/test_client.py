@@ -17,8 +17,12 @@
 
 
 import json
+import os
 from unittest import mock
 
+import fixtures
+import requests
+
 from pyopn import client, exceptions
 from pyopn.tests import base
 
@@ -26,7 +30,7 @@ from pyopn.tests import base
 class TestOPNClient(base.TestCase):
     """Clas for testning the OPNClient class methods."""
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_success(self, request_mock: mock.MagicMock) -> None:
         """Test a successful GET request."""
         response_mock = mock.MagicMock()
@@ -40,7 +44,7 @@ class TestOPNClient(base.TestCase):
             "/fake_url", auth=("", ""), timeout=10, verify=False
         )
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_get_failures(self, request_mock: mock.MagicMock) -> None:
         """Test a failed GET request."""
         response_mock = mock.MagicMock()
@@ -53,7 +57,30 @@ class TestOPNClient(base.TestCase):
             "/fake_url", auth=("", ""), timeout=5, verify=False
         )
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.get")
+    def test_get_stream_success(self, request_mock: mock.MagicMock) -> None:
+        """Test a successful streamed GET request."""
+        response_mock = request_mock.return_value.__enter__.return_value
+        response_mock.status_code = 200
+        response_mock.iter_content.return_value = iter([b"a,b\n", b"1,2\n"])
+        opnclient = client.OPNClient("", "", "")
+        chunks = list(opnclient._get_stream("fake_url", chunk_size=4))
+        self.assertEqual([b"a,b\n", b"1,2\n"], chunks)
+        request_mock.assert_called_once_with(
+            "/fake_url", auth=("", ""), timeout=5, verify=False, stream=True
+        )
+        response_mock.iter_content.assert_called_once_with(chunk_size=4)
+
+    @mock.patch("requests.Session.get")
+    def test_get_stream_failures(self, request_mock: mock.MagicMock) -> None:
+        """Test a failed streamed GET request."""
+        response_mock = request_mock.return_value.__enter__.return_value
+        response_mock.status_code = 401
+        response_mock.text = json.dumps({"a": "body"})
+        opnclient = client.OPNClient("", "", "")
+        self.assertRaises(exceptions.APIError, list, opnclient._get_stream("fake_url"))
+
+    @mock.patch("requests.Session.post")
     def test_post_success(self, request_mock: mock.MagicMock) -> None:
         """Test a successful POST request with a body."""
         response_mock = mock.MagicMock()
@@ -61,13 +88,27 @@ class TestOPNClient(base.TestCase):
         response_mock.text = json.dumps({"a": "body"})
         request_mock.return_value = response_mock
         opnclient = client.OPNClient("", "", "")
+        resp = opnclient._post("fake_url", {"a": "data"}, raw=False)
+        self.assertEqual({"a": "body"}, resp)
+        request_mock.assert_called_once_with(
+            "/fake_url", json={"a": "data"}, auth=("", ""), timeout=5, verify=False
+        )
+
+    @mock.patch("requests.Session.post")
+    def test_post_empty_body(self, request_mock: mock.MagicMock) -> None:
+        """Test that a POST request with an empty payload sends no body."""
+        response_mock = mock.MagicMock()
+        response_mock.status_code = 200
+        response_mock.text = json.dumps({"a": "body"})
+        request_mock.return_value = response_mock
+        opnclient = client.OPNClient("", "", "")
         resp = opnclient._post("fake_url", {}, raw=False)
         self.assertEqual({"a": "body"}, resp)
         request_mock.assert_called_once_with(
-            "/fake_url", json={}, auth=("", ""), timeout=5, verify=False
+            "/fake_url", auth=("", ""), timeout=5, verify=False
         )
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.post")
     def test_post_failures(self, request_mock: mock.MagicMock) -> None:
         """Test a failed POST request with a body."""
         response_mock = mock.MagicMock()
@@ -79,11 +120,11 @@ class TestOPNClient(base.TestCase):
             exceptions.APIError, opnclient._post, "fake_url", {}, raw=False
         )
         request_mock.assert_called_once_with(
-            "/fake_url", json={}, auth=("", ""), timeout=5, verify=False
+            "/fake_url", auth=("", ""), timeout=5, verify=False
         )
 
     # Test for _post_file method
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.post")
     def test_post_file_success(self, request_mock: mock.MagicMock) -> None:
         """Test a successful file POST request."""
         response_mock = mock.MagicMock()
@@ -95,11 +136,14 @@ class TestOPNClient(base.TestCase):
         opnclient = client.OPNClient("", "", "")
 
         # Mock open to simulate file content
-        with mock.patch("builtins.open", mock.mock_open(read_data="file content")):
+        with (
+            mock.patch("os.path.getsize", return_value=12),
+            mock.patch("builtins.open", mock.mock_open(read_data="file content")),
+        ):
             resp = opnclient._post_file("fake_url", "path/to/file.csv", raw=False)
             self.assertEqual({"status": "success"}, resp)
 
-        # Check that the correct arguments were passed to requests.post
+        # Check that the correct arguments were passed to the session
         request_mock.assert_called_once_with(
             "/fake_url",
             json={"payload": "file content", "filename": "file.csv"},
@@ -108,7 +152,7 @@ class TestOPNClient(base.TestCase):
             verify=False,
         )
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.post")
     def test_post_file_failure(self, request_mock: mock.MagicMock) -> None:
         """Test a failed file POST request."""
         response_mock = mock.MagicMock()
@@ -118,7 +162,10 @@ class TestOPNClient(base.TestCase):
 
         opnclient = client.OPNClient("", "", "")
 
-        with mock.patch("builtins.open", mock.mock_open(read_data="file content")):
+        with (
+            mock.patch("os.path.getsize", return_value=12),
+            mock.patch("builtins.open", mock.mock_open(read_data="file content")),
+        ):
             self.assertRaises(
                 exceptions.APIError,
                 opnclient._post_file,
@@ -135,8 +182,38 @@ class TestOPNClient(base.TestCase):
             verify=False,
         )
 
+    @mock.patch("requests.Session.post")
+    def test_post_file_streamed(self, request_mock: mock.MagicMock) -> None:
+        """Test that large files are streamed as a chunked JSON payload."""
+        response_mock = mock.MagicMock()
+        response_mock.status_code = 200
+        response_mock.text = json.dumps({"status": "success"})
+        request_mock.return_value = response_mock
+
+        file_content = 'ip_address,hostname,description\n1.2.3.4,a,"b"\n' * 4096
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, "big.csv")
+        with open(path, "w") as f:
+            f.write(file_content)
+
+        opnclient = client.OPNClient("", "", "")
+        resp = opnclient._post_file("fake_url", path, raw=False)
+        self.assertEqual({"status": "success"}, resp)
+
+        request_mock.assert_called_once_with(
+            "/fake_url",
+            data=mock.ANY,
+            headers={"Content-Type": "application/json"},
+            auth=("", ""),
+            timeout=5,
+            verify=False,
+        )
+        body = b"".join(request_mock.call_args.kwargs["data"])
+        self.assertEqual(
+            {"payload": file_content, "filename": "big.csv"}, json.loads(body)
+        )
+
     # Test for _post_csv_data method
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.post")
     def test_post_csv_data_success(self, request_mock: mock.MagicMock) -> None:
         """Test a successful CSV data POST request."""
         response_mock = mock.MagicMock()
@@ -157,7 +234,7 @@ class TestOPNClient(base.TestCase):
             verify=False,
         )
 
-    @mock.patch("requests.post")
+    @mock.patch("requests.Session.post")
     def test_post_csv_data_failure(self, request_mock: mock.MagicMock) -> None:
         """Test a failed CSV data POST request."""
         response_mock = mock.MagicMock()
@@ -182,3 +259,15 @@ class TestOPNClient(base.TestCase):
             timeout=5,
             verify=False,
         )
+
+    @mock.patch("requests.Session.close")
+    def test_close_only_private_session(self, close_mock: mock.MagicMock) -> None:
+        """Test that a standalone client closes its own session only."""
+        shared = requests.Session()
+        with client.OPNClient("", "", "", session=shared):
+            pass
+        close_mock.assert_not_called()
+        with client.OPNClient("", "", "") as opnclient:
+            pass
+        close_mock.assert_called_once_with()
+        self.assertIsNot(shared, opnclient._session)
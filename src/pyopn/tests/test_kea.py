@@ -0,0 +1,208 @@
+# Copyright 2024 Alex Christy
+#
+# This file is part of pyopn
+#
+# pyopn is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyopn is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyopn. If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+import os
+import uuid
+from unittest import mock
+
+import fixtures
+
+from pyopn import exceptions
+from pyopn.core import kea
+from pyopn.tests import base
+
+
+class TestDhcpv4Client(base.TestCase):
+    """Class for testing the Kea Dhcpv4Client class methods."""
+
+    def setUp(self) -> None:
+        """Set up a client whose session returns a successful response."""
+        super().setUp()
+        response_mock = mock.MagicMock()
+        response_mock.status_code = 200
+        response_mock.text = json.dumps({"result": "saved"})
+        self.session = mock.MagicMock()
+        self.session.get.return_value = response_mock
+        self.session.post.return_value = response_mock
+        self.dhcpv4 = kea.Dhcpv4Client("", "", "", session=self.session)
+
+    def _posted_urls(self) -> list[str]:
+        """Return the URLs POSTed to in call order."""
+        return [call.args[0] for call in self.session.post.call_args_list]
+
+    def test_bulk_add_reservations(self) -> None:
+        """Test that bulk adds are applied with a single set and reconfigure."""
+        resp = self.dhcpv4.bulk_add_reservations([{"a": 1}, {"b": 2}])
+        self.assertEqual(
+            [
+                "/kea/dhcpv4/addReservation",
+                "/kea/dhcpv4/addReservation",
+                "/kea/dhcpv4/set",
+                "/kea/service/reconfigure",
+            ],
+            self._posted_urls(),
+        )
+        self.assertEqual(2, len(resp["actions"]))
+
+    def test_apply_mixed_actions(self) -> None:
+        """Test that apply dispatches actions with their arguments."""
+        self.dhcpv4.apply([("set_subnet", "uuid1", {"a": 1}), ("del_peer", "uuid2")])
+        self.assertEqual(
+            [
+                "/kea/dhcpv4/setSubnet/uuid1",
+                "/kea/dhcpv4/delPeer/uuid2",
+                "/kea/dhcpv4/set",
+                "/kea/service/reconfigure",
+            ],
+            self._posted_urls(),
+        )
+
+    def test_apply_unsupported_action(self) -> None:
+        """Test that apply rejects methods that are not mutating endpoints."""
+        self.assertRaises(ValueError, self.dhcpv4.apply, [("get", {})])
+        self.session.post.assert_not_called()
+
+    def test_apply_invalid_arguments(self) -> None:
+        """Test that apply rejects actions with missing or extra arguments."""
+        for action in (
+            ("add_reservation",),
+            ("del_peer", "uuid1", {"a": 1}),
+            ("set_subnet", {"a": 1}),
+            ("set_subnet",),
+            ("set_subnet", "uuid1", "not a dict"),
+        ):
+            self.assertRaises(
+                ValueError,
+                self.dhcpv4.apply,
+                [("del_peer", "uuid1"), action],
+            )
+        self.session.post.assert_not_called()
+
+    def test_mutate_by_uuid_object(self) -> None:
+        """Test that mutating methods and apply accept `uuid.UUID` values."""
+        value = uuid.uuid4()
+        self.dhcpv4.del_subnet(value)  # type: ignore[arg-type]
+        self.dhcpv4.apply([("set_peer", value, {"a": 1})])
+        self.assertEqual(
+            [
+                f"/kea/dhcpv4/delSubnet/{value}",
+                f"/kea/dhcpv4/setPeer/{value}",
+                "/kea/dhcpv4/set",
+                "/kea/service/reconfigure",
+            ],
+            self._posted_urls(),
+        )
+
+    def test_defer_apply(self) -> None:
+        """Test that defer_apply=False applies the change immediately."""
+        self.dhcpv4.del_reservation("uuid1")
+        self.assertEqual(["/kea/dhcpv4/delReservation/uuid1"], self._posted_urls())
+
+        self.session.post.reset_mock()
+        self.dhcpv4.del_reservation("uuid1", defer_apply=False)
+        self.assertEqual(
+            [
+                "/kea/dhcpv4/delReservation/uuid1",
+                "/kea/dhcpv4/set",
+                "/kea/service/reconfigure",
+            ],
+            self._posted_urls(),
+        )
+
+    def test_get_by_uuid_object(self) -> None:
+        """Test that getters accept `uuid.UUID` values as well as strings."""
+        value = uuid.uuid4()
+        self.dhcpv4.get_subnet(value)  # type: ignore[arg-type]
+        self.dhcpv4.get_reservation(value)  # type: ignore[arg-type]
+        self.dhcpv4.get_peer(value)  # type: ignore[arg-type]
+        self.assertEqual(
+            [
+                f"/kea/dhcpv4/getSubnet/{value}",
+                f"/kea/dhcpv4/getReservation/{value}",
+                f"/kea/dhcpv4/getPeer/{value}",
+            ],
+            [call.args[0] for call in self.session.get.call_args_list],
+        )
+
+    def test_download_reservations(self) -> None:
+        """Test that downloaded reservation chunks are joined and decoded."""
+        response_mock = self.session.get.return_value.__enter__.return_value
+        response_mock.status_code = 200
+        response_mock.iter_content.return_value = iter([b"ip_address\n", b"1.2.3.4\n"])
+        self.assertEqual("ip_address\n1.2.3.4\n", self.dhcpv4.download_reservations())
+
+    def test_iter_reservations_csv_chunk_size(self) -> None:
+        """Test that the chunk size is passed through to the streamed response."""
+        response_mock = self.session.get.return_value.__enter__.return_value
+        response_mock.status_code = 200
+        response_mock.iter_content.return_value = iter([b"ip_address\n"])
+        self.assertEqual(
+            [b"ip_address\n"], list(self.dhcpv4.iter_reservations_csv(chunk_size=16))
+        )
+        response_mock.iter_content.assert_called_once_with(chunk_size=16)
+        self.assertTrue(self.session.get.call_args.kwargs["stream"])
+
+    def test_download_reservations_to_file(self) -> None:
+        """Test that downloaded reservations replace the destination file."""
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(tmp_dir, "reservations.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("old")
+        response_mock = self.session.get.return_value.__enter__.return_value
+        response_mock.status_code = 200
+        response_mock.iter_content.return_value = iter([b"ip_address\n", b"1.2.3.4\n"])
+        self.dhcpv4.download_reservations_to_file(path)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual("ip_address\n1.2.3.4\n", f.read())
+        self.assertEqual(["reservations.csv"], os.listdir(tmp_dir))
+
+    def test_download_reservations_to_file_failure(self) -> None:
+        """Test that a failed download leaves an existing file untouched."""
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(tmp_dir, "reservations.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("precious")
+        response_mock = self.session.get.return_value.__enter__.return_value
+        response_mock.status_code = 401
+        response_mock.text = "Unauthorized"
+        self.assertRaises(
+            exceptions.APIError, self.dhcpv4.download_reservations_to_file, path
+        )
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual("precious", f.read())
+        self.assertEqual(["reservations.csv"], os.listdir(tmp_dir))
+
+    def test_apply_stops_on_failed_result(self) -> None:
+        """Test that a rejected action stops the batch before it is applied."""
+        failed_mock = mock.MagicMock()
+        failed_mock.status_code = 200
+        failed_mock.text = json.dumps({"result": "failed", "validations": {}})
+        self.session.post.side_effect = [
+            self.session.post.return_value,
+            failed_mock,
+        ]
+        self.assertRaises(
+            exceptions.APIError,
+            self.dhcpv4.bulk_add_reservations,
+            [{"a": 1}, {"b": 2}],
+        )
+        self.assertEqual(
+            ["/kea/dhcpv4/addReservation", "/kea/dhcpv4/addReservation"],
+            self._posted_urls(),
+        )
@@ -0,0 +1,137 @@
+"""Helpers shared by the sync and asyncio OPNsense API wrappers."""
+
+import ipaddress
+import logging
+import re
+from pathlib import Path
+from typing import Optional, Union
+
+# Create a module-level logger
+logger = logging.getLogger(__name__)
+
+# Splits an http(s) URL into scheme, network location, and optional path. URLs
+# with a query or fragment are rejected since they cannot prefix API endpoints.
+_URL_RE = re.compile(r"^(https?)://([^/?#\s]+)(/[^?#\s]*)?$", re.IGNORECASE)
+
+# Splits a network location into host (bracketed for IPv6) and optional port
+_NETLOC_RE = re.compile(r"^(\[[0-9A-Fa-f:.]+\]|[^:\[\]]+)(?::(\d{1,5}))?$")
+_HOSTNAME_RE = re.compile(
+    r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)(?:\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*\.?$"
+)
+_NUMERIC_HOST_RE = re.compile(r"^[0-9.]+$")
+_MAX_PORT = 65535
+
+# Matches key="value" and secret="value" lines in an OPNsense API key file
+_CRED_RE = re.compile(
+    r'^[ \t]*(key|secret)[ \t]*=[ \t]*"?([^"\r\n]*?)"?[ \t]*\r?$', re.MULTILINE
+)
+
+
+def _is_valid_netloc(netloc: str) -> bool:
+    """Check that a network location is a valid host with an optional port."""
+    match = _NETLOC_RE.match(netloc)
+    if not match:
+        return False
+
+    host, port = match.groups()
+    if port is not None and not 0 < int(port) <= _MAX_PORT:
+        return False
+
+    # Bracketed hosts are IPv6 literals, e.g. [fe80::1]
+    if host.startswith("["):
+        return _is_ip_address(host[1:-1], ipaddress.IPv6Address)
+
+    # Hosts made only of digits and dots must be dotted-quad IPv4 addresses
+    if _NUMERIC_HOST_RE.match(host):
+        return _is_ip_address(host, ipaddress.IPv4Address)
+    return bool(_HOSTNAME_RE.match(host))
+
+
+def _is_ip_address(
+    host: str, address_class: type[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]
+) -> bool:
+    """Check that a host parses as the given IP address class."""
+    try:
+        address_class(host)
+    except ValueError:
+        return False
+    return True
+
+
+def load_credentials(
+    api_key_file: Optional[Union[str, Path]] = None,
+    api_key: Optional[str] = None,
+    api_secret: Optional[str] = None,
+) -> tuple[str, str]:
+    """Load the API key and secret from a key file or from the given values.
+
+    :param str | Path api_key_file: Path to the file containing API credentials
+    :param str api_key: API key, used with `api_secret` if no file is given
+    :param str api_secret: API secret, used with `api_key` if no file is given
+    :returns: A tuple containing the API key and secret
+    :rtype: tuple[str, str]
+    :raises ValueError: If neither a key file nor both key and secret are provided
+    """
+    if api_key_file:
+        logger.info("Initializing OPNsense API credentials with API key file.")
+        return load_keys_from_file(api_key_file)
+    if api_key and api_secret:
+        logger.info("Initializing OPNsense API credentials with API key and secret.")
+        return api_key, api_secret
+
+    logger.error(
+        "Initialization failed: Neither api_key_file nor both api_key and api_secret provided."
+    )
+    msg = "You must provide either an api_key_file path or both api_key and api_secret for initialization."
+    raise ValueError(msg)
+
+
+def load_keys_from_file(file_path: Union[str, Path]) -> tuple[str, str]:
+    """Load the API key and secret from a file.
+
+    :param str | Path file_path: Path to the file containing API credentials
+    :returns: A tuple containing the API key and secret
+    :rtype: tuple[str, str]
+    :raises FileNotFoundError: If the file does not exist
+    :raises ValueError: If the file contents are invalid or malformed
+    """
+    logger.debug("Reading API credentials from file: %s", file_path)
+    try:
+        text = Path(file_path).read_text(encoding="utf-8")
+    except FileNotFoundError as e:
+        logger.error("File not found: %s", file_path)
+        msg = f"The file at {file_path} does not exist."
+        raise FileNotFoundError(msg) from e
+    except (OSError, UnicodeDecodeError) as e:
+        msg = f"Error reading the API key file: {e}"
+        logger.error(msg)
+        raise ValueError(msg) from e
+
+    keys = dict(_CRED_RE.findall(text))
+    if "key" not in keys or "secret" not in keys:
+        logger.error("Invalid file format in %s: Missing 'key' or 'secret'.", file_path)
+        msg = (
+            "The file must contain both 'key' and 'secret' in the format key=\"value\"."
+        )
+        raise ValueError(msg)
+
+    logger.info("API credentials successfully loaded from file: %s", file_path)
+    return keys["key"], keys["secret"]
+
+
+def format_base_url(base_url: str, strict: bool = False) -> str:
+    """Ensure that the base_url is properly formatted.
+
+    :param str base_url: URL of the OPNsense deployment
+    :param bool strict: If True, also validate the host and port of the URL
+    :raises ValueError: If the base_url is not a valid http(s) URL
+    """
+    match = _URL_RE.match(base_url.strip())
+    if not match or (strict and not _is_valid_netloc(match.group(2))):
+        msg = f"Provided OPNsense base URL is not valid: {base_url}"
+        raise ValueError(msg)
+
+    scheme, netloc, path = match.groups()
+    if path and path.rstrip("/").endswith("/api"):
+        return f"{scheme.lower()}://{netloc}{path.rstrip('/')}"
+    return f"{scheme.lower()}://{netloc}/api"